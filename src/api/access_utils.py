@@ -1,8 +1,16 @@
-from fastapi import HTTPException
+import os
+
+from fastapi import Depends, HTTPException
 from markkk.logger import logger
 
+from .async_database import run_in_db_thread
+from .auth import AuthHandler
+from .cache import TTLCache
 from .database import admins_collection, students_collection
 from .error_msg import ErrorMsg as MSG
+from .models.misc import Principal
+
+auth_handler = AuthHandler()
 
 
 class Access:
@@ -12,64 +20,133 @@ class Access:
     2. student-hg
     3. admin (admin-read or admin-write)
     4. admin-write
+
+    All roles of a user are resolved together in one database round trip and
+    kept in a bounded TTL cache shared across requests. If role claims are
+    enabled (JWT_ROLE_CLAIMS), they are read from the token instead.
+    Any code path that changes a user's roles must call `Access.invalidate(username)`.
     """
 
+    CACHE_TTL_SECONDS = float(os.environ.get("ACCESS_CACHE_TTL_SECONDS", 30))
+    CACHE_MAX_SIZE = int(os.environ.get("ACCESS_CACHE_MAX_SIZE", 4096))
+    cache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS)
+
     @staticmethod
-    def is_student(username: str) -> bool:
-        """ Check if the given username is an existing Student in the database """
+    def resolve(username: str) -> Principal:
+        """ Get all roles of the given username, from cache if possible """
+        principal: Principal = Access.cache.get(username)
+        if principal is not None:
+            return principal
+
+        principal = Access._query_principal(username)
+        Access.cache.set(username, principal)
+        return principal
+
+    @staticmethod
+    async def resolve_async(username: str) -> Principal:
+        """ Non-blocking version of resolve, for `async def` routes """
+        principal: Principal = Access.cache.get(username)
+        if principal is not None:
+            return principal
+
+        principal = await run_in_db_thread(Access._query_principal, username)
+        Access.cache.set(username, principal)
+        return principal
+
+    @staticmethod
+    def _query_principal(username: str) -> Principal:
+        """ Look up both the students and the admins collection in one query """
+        # NOTE: $unionWith requires MongoDB 4.4+
+        match = {"$match": {"username": username}}
+        pipeline = [
+            match,
+            {"$limit": 1},
+            {
+                "$project": {
+                    "_id": 0,
+                    "student": {"$literal": True},
+                    "is_house_guardian": 1,
+                }
+            },
+            {
+                "$unionWith": {
+                    "coll": admins_collection.name,
+                    "pipeline": [
+                        match,
+                        {"$limit": 1},
+                        {
+                            "$project": {
+                                "_id": 0,
+                                "admin": {"$literal": True},
+                                "read_only": 1,
+                            }
+                        },
+                    ],
+                }
+            },
+        ]
         try:
-            student_info: dict = students_collection.find_one({"username": username})
+            matches = list(students_collection.aggregate(pipeline))
         except Exception as e:
             logger.error(MSG.DB_QUERY_ERROR)
             logger.error(e)
             raise HTTPException(status_code=500, detail=MSG.DB_QUERY_ERROR)
-        if student_info:
-            return True
-        return False
+
+        student_info = next((i for i in matches if i.get("student")), None)
+        admin_info = next((i for i in matches if i.get("admin")), None)
+        return Principal(
+            username=username,
+            is_student=bool(student_info),
+            is_student_hg=bool(
+                student_info and student_info.get("is_house_guardian", False)
+            ),
+            is_admin=bool(admin_info),
+            is_admin_write=bool(
+                admin_info and admin_info.get("read_only", True) == False
+            ),
+        )
+
+    @staticmethod
+    def invalidate(username: str) -> None:
+        """ Drop cached roles and outdate role claims of the given username """
+        Access.cache.pop(username)
+        auth_handler.role_versions.bump(username)
+
+    @staticmethod
+    async def principal(
+        payload: dict = Depends(auth_handler.payload_wrapper),
+    ) -> Principal:
+        """
+        FastAPI dependency: resolve the roles of the authenticated user once,
+        the result is shared by everything within the same request.
+
+        Up-to-date signed role claims in the token are used as they are,
+        without querying the database.
+        """
+        username: str = payload["sub"]
+        roles = auth_handler.role_claims(payload)
+        if roles is not None:
+            return Principal(username=username, **roles)
+        return await Access.resolve_async(username)
+
+    @staticmethod
+    def is_student(username: str) -> bool:
+        """ Check if the given username is an existing Student in the database """
+        return Access.resolve(username).is_student
 
     @staticmethod
     def is_student_hg(username: str) -> bool:
         """ Check if the given username is an existing Student House Guardian """
-        try:
-            student_info: dict = students_collection.find_one({"username": username})
-        except Exception as e:
-            logger.error(MSG.DB_QUERY_ERROR)
-            logger.error(e)
-            raise HTTPException(status_code=500, detail=MSG.DB_QUERY_ERROR)
-        if student_info and student_info.get("is_house_guardian", False):
-            return True
-        return False
+        return Access.resolve(username).is_student_hg
 
     @staticmethod
     def is_admin(username: str) -> bool:
-        try:
-            admin_info: dict = admins_collection.find_one({"username": username})
-        except Exception as e:
-            logger.error(MSG.DB_QUERY_ERROR)
-            logger.error(e)
-            raise HTTPException(status_code=500, detail=MSG.DB_QUERY_ERROR)
-        if admin_info:
-            return True
-        return False
+        return Access.resolve(username).is_admin
 
     @staticmethod
     def is_admin_write(username: str) -> bool:
-        try:
-            admin_info: dict = admins_collection.find_one({"username": username})
-        except Exception as e:
-            logger.error(MSG.DB_QUERY_ERROR)
-            logger.error(e)
-            raise HTTPException(status_code=500, detail=MSG.DB_QUERY_ERROR)
-        if admin_info and admin_info.get("read_only", True) == False:
-            return True
-        return False
+        return Access.resolve(username).is_admin_write
 
     @staticmethod
     def at_least_student_hg_write(username: str) -> bool:
-        if Access.is_student_hg(username):
-            return True
-
-        if Access.is_admin_write(username):
-            return True
-
-        return False
+        return Access.resolve(username).at_least_student_hg_write
@@ -0,0 +1,243 @@
+"""
+Asynchronous data-access layer for the `async def` routes.
+
+Every blocking pymongo call is offloaded to a dedicated thread pool, so a slow
+query never blocks the event loop and concurrent requests overlap their I/O.
+Collection handles are exposed under the same names as in `database.py`:
+
+    from ..async_database import *
+
+    student_info = await students_collection.find_one({"student_id": sid})
+    events = await events_collection.find().sort("start_time").to_list()
+
+    async with client.start_session() as session:
+        async with session.start_transaction():
+            await applications_collection.insert_one(doc, session=session)
+
+Set DB_THREADPOOL_SIZE=0 to run every call inline on the event loop instead
+(the old blocking behaviour, for benchmarking and debugging only).
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, List, Optional
+
+from pymongo.client_session import ClientSession
+from pymongo.collection import Collection
+
+from . import database
+
+__all__ = [
+    "run_in_db_thread",
+    "client",
+    "users_collection",
+    "admins_collection",
+    "students_collection",
+    "applications_collection",
+    "application_periods_collection",
+    "contracts_collection",
+    "events_collection",
+    "records_collection",
+    "rooms_collection",
+    "refresh_tokens_collection",
+]
+
+THREADPOOL_SIZE = int(os.environ.get("DB_THREADPOOL_SIZE", 64))
+_executor = (
+    ThreadPoolExecutor(max_workers=THREADPOOL_SIZE, thread_name_prefix="db")
+    if THREADPOOL_SIZE > 0
+    else None
+)
+
+
+async def run_in_db_thread(fn: Callable, *args, **kwargs) -> Any:
+    """ Run a blocking database call in the database thread pool """
+    if _executor is None:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+
+def _unwrap_session(kwargs: dict) -> dict:
+    session = kwargs.get("session")
+    if isinstance(session, AsyncSession):
+        kwargs["session"] = session.delegate
+    return kwargs
+
+
+class AsyncCursor:
+    """
+    Lazily built cursor: `sort`, `limit`, `skip` and `batch_size` are
+    recorded and applied when the cursor is consumed in the thread pool.
+    """
+
+    def __init__(self, cursor_factory: Callable):
+        self._cursor_factory = cursor_factory
+        self._modifiers = []
+        self._cursor = None
+
+    def _chain(self, name: str, *args, **kwargs) -> "AsyncCursor":
+        self._modifiers.append((name, args, kwargs))
+        return self
+
+    def sort(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("sort", *args, **kwargs)
+
+    def limit(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("limit", *args, **kwargs)
+
+    def skip(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("skip", *args, **kwargs)
+
+    def batch_size(self, *args, **kwargs) -> "AsyncCursor":
+        return self._chain("batch_size", *args, **kwargs)
+
+    def _build(self):
+        if self._cursor is None:
+            cursor = self._cursor_factory()
+            for name, args, kwargs in self._modifiers:
+                cursor = getattr(cursor, name)(*args, **kwargs)
+            self._cursor = cursor
+        return self._cursor
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        def _fetch():
+            cursor = self._build()
+            return list(cursor) if length is None else list(islice(cursor, length))
+
+        return await run_in_db_thread(_fetch)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self, batch: int = 100):
+        while True:
+            docs = await run_in_db_thread(lambda: list(islice(self._build(), batch)))
+            for doc in docs:
+                yield doc
+            if len(docs) < batch:
+                return
+
+
+class AsyncCollection:
+    """ Awaitable counterpart of a (sync) pymongo Collection """
+
+    def __init__(self, collection: Collection):
+        self.delegate = collection
+
+    @property
+    def name(self) -> str:
+        return self.delegate.name
+
+    async def _run(self, method: str, *args, **kwargs) -> Any:
+        fn = getattr(self.delegate, method)
+        return await run_in_db_thread(fn, *args, **_unwrap_session(kwargs))
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(
+            partial(self.delegate.find, *args, **_unwrap_session(kwargs))
+        )
+
+    def aggregate(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(
+            partial(self.delegate.aggregate, *args, **_unwrap_session(kwargs))
+        )
+
+    async def find_one(self, *args, **kwargs):
+        return await self._run("find_one", *args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return await self._run("find_one_and_update", *args, **kwargs)
+
+    async def find_one_and_delete(self, *args, **kwargs):
+        return await self._run("find_one_and_delete", *args, **kwargs)
+
+    async def insert_one(self, *args, **kwargs):
+        return await self._run("insert_one", *args, **kwargs)
+
+    async def insert_many(self, *args, **kwargs):
+        return await self._run("insert_many", *args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return await self._run("update_one", *args, **kwargs)
+
+    async def update_many(self, *args, **kwargs):
+        return await self._run("update_many", *args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return await self._run("delete_one", *args, **kwargs)
+
+    async def delete_many(self, *args, **kwargs):
+        return await self._run("delete_many", *args, **kwargs)
+
+    async def bulk_write(self, *args, **kwargs):
+        return await self._run("bulk_write", *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs) -> int:
+        return await self._run("count_documents", *args, **kwargs)
+
+    async def distinct(self, *args, **kwargs) -> list:
+        return await self._run("distinct", *args, **kwargs)
+
+
+class AsyncTransaction:
+    def __init__(self, session: "AsyncSession", **kwargs):
+        self.session = session
+        self.kwargs = kwargs
+
+    async def __aenter__(self):
+        self.session.delegate.start_transaction(**self.kwargs)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if not self.session.delegate.in_transaction:
+            return
+        if exc_type is None:
+            await run_in_db_thread(self.session.delegate.commit_transaction)
+        else:
+            await run_in_db_thread(self.session.delegate.abort_transaction)
+
+
+class AsyncSession:
+    """ Awaitable wrapper of a pymongo ClientSession, for transactions """
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        self.kwargs = kwargs
+        self.delegate: ClientSession = None
+
+    def start_transaction(self, **kwargs) -> AsyncTransaction:
+        return AsyncTransaction(self, **kwargs)
+
+    async def __aenter__(self) -> "AsyncSession":
+        self.delegate = await run_in_db_thread(self.client.start_session, **self.kwargs)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await run_in_db_thread(self.delegate.end_session)
+
+
+class AsyncClient:
+    def __init__(self, client):
+        self.delegate = client
+
+    def start_session(self, **kwargs) -> AsyncSession:
+        return AsyncSession(self.delegate, **kwargs)
+
+
+### Async MongoDB Collection Reference ###
+client = AsyncClient(database.client)
+users_collection = AsyncCollection(database.users_collection)
+admins_collection = AsyncCollection(database.admins_collection)
+students_collection = AsyncCollection(database.students_collection)
+applications_collection = AsyncCollection(database.applications_collection)
+application_periods_collection = AsyncCollection(
+    database.application_periods_collection
+)
+contracts_collection = AsyncCollection(database.contracts_collection)
+events_collection = AsyncCollection(database.events_collection)
+records_collection = AsyncCollection(database.records_collection)
+rooms_collection = AsyncCollection(database.rooms_collection)
+refresh_tokens_collection = AsyncCollection(database.refresh_tokens_collection)
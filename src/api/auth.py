@@ -1,5 +1,10 @@
+import hashlib
 import os
+import time
+import uuid
 from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
 
 import jwt
 from fastapi import HTTPException, Security
@@ -7,6 +12,37 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from markkk.logger import logger
 from passlib.context import CryptContext
 
+from .cache import TTLCache
+from .hashing import password_hasher
+
+ROLE_CLAIM_KEYS = ("is_student", "is_student_hg", "is_admin", "is_admin_write")
+
+
+class RoleVersionTable:
+    """
+    In-memory per-user role version table.
+
+    Tokens carrying role claims also carry the role version of their subject
+    at issuance. Bumping a user's version (on promotion, demotion, etc.)
+    makes all previously issued role claims of that user stale immediately.
+
+    Versions are prefixed by a per-process epoch, so claims issued before a
+    restart (or by another worker process) are never trusted blindly.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, username: str) -> str:
+        return f"{self.epoch}.{self._versions.get(username, 0)}"
+
+    def bump(self, username: str) -> str:
+        with self._lock:
+            self._versions[username] = self._versions.get(username, 0) + 1
+        return self.get(username)
+
 
 class AuthHandler:
     security = HTTPBearer()
@@ -16,7 +52,19 @@ class AuthHandler:
     if SECRET_KEY in (None, "None", "NA", "N.A.", ""):
         SECRET_KEY = "replace_me_replace_me_replace_me"
     ALGORITHM = "HS256"  # HS256 (HMAC with SHA-256)
-    ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+    # keep it short when clients use the refresh token flow (/api/auth/refresh)
+    ACCESS_TOKEN_EXPIRE_MINUTES = int(
+        os.environ.get("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24)  # 24 hours
+    )
+    # embed user roles into tokens as signed claims
+    ROLE_CLAIMS = os.environ.get("JWT_ROLE_CLAIMS", "").lower() in ("1", "true", "yes")
+    # shared by all AuthHandler instances
+    role_versions = RoleVersionTable()
+    # already verified tokens, token digest -> payload, evicted at token 'exp'
+    TOKEN_CACHE_SIZE = int(os.environ.get("JWT_TOKEN_CACHE_SIZE", 10000))
+    token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=0)
+    # revoked tokens, token digest -> True, kept until token 'exp'
+    revoked_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=0)
 
     def get_password_hash(self, password: str) -> str:
         return self.pwd_context.hash(password)
@@ -24,23 +72,95 @@ class AuthHandler:
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return self.pwd_context.verify(plain_password, hashed_password)
 
-    def encode_token(self, user_id: str) -> str:
+    async def get_password_hash_async(self, password: str) -> str:
+        """ Non-blocking version of get_password_hash, runs in a process pool """
+        return await password_hasher.hash(password)
+
+    async def get_password_hashes_async(self, passwords: List[str]) -> List[str]:
+        """ Hash a batch of passwords across all processes of the pool """
+        return await password_hasher.hash_many(passwords)
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """ Non-blocking version of verify_password, runs in a process pool """
+        return await password_hasher.verify(plain_password, hashed_password)
+
+    def encode_token(self, user_id: str, roles: Dict[str, bool] = None) -> str:
         payload = {
             "exp": datetime.utcnow()
             + timedelta(days=0, minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES),
             "iat": datetime.utcnow(),
             "sub": user_id,
         }
+        if roles is not None:
+            payload["roles"] = {k: bool(roles.get(k, False)) for k in ROLE_CLAIM_KEYS}
+            payload["rv"] = self.role_versions.get(user_id)
         return jwt.encode(payload, self.SECRET_KEY, algorithm=self.ALGORITHM)
 
-    def decode_token(self, token: str) -> str:
+    @staticmethod
+    def token_digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def decode_payload(self, token: str) -> dict:
+        """
+        Verify and decode a token.
+
+        Verified tokens are cached until they expire, so a token reused by
+        the client is only verified (HMAC) once.
+        """
+        key = self.token_digest(token)
+        payload: dict = self.token_cache.get(key)
+        if payload is not None:
+            return payload
+
+        if self.revoked_tokens.get(key):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
         try:
             payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            return payload["sub"]
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Signature has expired")
         except jwt.InvalidTokenError as e:
             raise HTTPException(status_code=401, detail="Invalid token")
 
+        if "exp" in payload:
+            self.token_cache.set(key, payload, ttl=payload["exp"] - time.time())
+        return payload
+
+    def revoke_token(self, token: str) -> None:
+        """ Reject the given token from now on, until it expires anyway """
+        key = self.token_digest(token)
+        self.token_cache.pop(key)
+        ttl = self.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        try:
+            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            ttl = payload["exp"] - time.time()
+        except Exception:
+            pass
+        self.revoked_tokens.set(key, True, ttl=ttl)
+
+    def decode_token(self, token: str) -> str:
+        return self.decode_payload(token)["sub"]
+
+    def role_claims(self, payload: dict) -> Optional[Dict[str, bool]]:
+        """
+        Get the signed role claims from a decoded token payload.
+
+        Return: None if the token carries no role claims or if the claims
+        are stale (role version of the user has changed since issuance).
+        """
+        roles = payload.get("roles")
+        if not isinstance(roles, dict):
+            return None
+        if payload.get("rv") != self.role_versions.get(payload.get("sub")):
+            logger.debug(f"Stale role claims for user: '{payload.get('sub')}'")
+            return None
+        return {k: bool(roles.get(k, False)) for k in ROLE_CLAIM_KEYS}
+
     def auth_wrapper(self, auth: HTTPAuthorizationCredentials = Security(security)):
         return self.decode_token(auth.credentials)
+
+    def payload_wrapper(
+        self, auth: HTTPAuthorizationCredentials = Security(security)
+    ) -> dict:
+        return self.decode_payload(auth.credentials)
@@ -0,0 +1,136 @@
+"""
+Register a cohort of students from a CSV / XLSX file via the bulk registration API.
+
+Usage:
+    python bulk_register.py templates/student_dummy_info.xlsx --url http://127.0.0.1:8000
+
+Columns may either be named after the `Student` model fields (username,
+full_name, gender, ...) or follow the column names of
+`templates/student_dummy_info.xlsx` (student id, full name, gender, ...).
+"""
+import argparse
+import csv
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+from markkk.logger import logger
+
+src_dir = Path(__file__).resolve().parent.parent.parent
+
+sys.path.insert(0, str(src_dir))
+
+from api.models.student import Student
+from api.routes.auth import BULK_MAX_ROWS, auth_handler
+
+###############################################
+## Configs
+LOCAL_ROOT = "http://127.0.0.1:8000"
+DEFAULT_PASSWORD = "pass1234"
+###############################################
+
+# template column name -> Student field name
+TEMPLATE_COLUMNS: Dict[str, str] = {
+    "student id": "username",
+    "full name": "full_name",
+    "gender": "gender",
+    "enrolment type": "enrollment_type",
+    "year of enrolment": "year_of_enrollment",
+    "sc status": "sc_status",
+    "pr status": "pr_status",
+    "nationality": "nationality",
+    "phone number": "phone_number",
+    "sutd mail": "email_sutd",
+    "personal mail": "email_personal",
+    "local postal code": "local_addr_post_code",
+    "local street address": "local_addr_street",
+    "local address unit": "local_addr_unit",
+}
+STR_FIELDS = (
+    "username",
+    "password",
+    "phone_number",
+    "local_addr_post_code",
+    "local_addr_street",
+    "local_addr_unit",
+)
+BOOL_FIELDS = ("sc_status", "pr_status")
+
+
+def read_rows(filepath: Path) -> List[dict]:
+    """ Read a CSV or XLSX file into a list of dicts """
+    if filepath.suffix.lower() == ".csv":
+        with filepath.open(newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+    elif filepath.suffix.lower() in (".xlsx", ".xls"):
+        import pandas as pd
+
+        data = pd.read_excel(filepath, engine="openpyxl")
+        data = data.astype(object).fillna("")
+        return data.to_dict(orient="records")
+    else:
+        raise ValueError(f"Unsupported file type: {filepath.suffix}")
+
+
+def to_student_payload(row: dict, default_password: str) -> dict:
+    payload = {}
+    for key, value in row.items():
+        key = str(key).strip()
+        field = TEMPLATE_COLUMNS.get(key.lower(), key)
+        if field not in Student.__fields__ or value == "" or value is None:
+            continue
+        payload[field] = value
+
+    for field in STR_FIELDS:
+        if field in payload:
+            payload[field] = str(payload[field]).strip()
+    for field in BOOL_FIELDS:
+        if isinstance(payload.get(field), str):
+            payload[field] = payload[field].strip().lower() in ("true", "yes", "1")
+    payload.setdefault("password", default_password)
+    return payload
+
+
+def bulk_register(
+    rows: List[dict], api_root: str, token: str, batch_size: int = BULK_MAX_ROWS
+) -> List[dict]:
+    """ Post rows to the bulk registration endpoint, return per-row results """
+    headers = {
+        "accept": "application/json",
+        "Content-Type": "application/json",
+        "Authorization": "Bearer " + token,
+    }
+    results = []
+    for offset in range(0, len(rows), batch_size):
+        batch = rows[offset : offset + batch_size]
+        response = requests.post(
+            url=api_root + "/api/auth/register/students", headers=headers, json=batch
+        )
+        if response.status_code != 201:
+            raise Exception(f"Bulk registration failed: {response.text}")
+        for result in response.json()["results"]:
+            result["index"] += offset
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk register students")
+    parser.add_argument("file", type=Path, help="CSV or XLSX file of students")
+    parser.add_argument("--url", default=LOCAL_ROOT, help="API root URL")
+    parser.add_argument("--token", help="Admin-write JWT, generated if omitted")
+    parser.add_argument("--admin", default="admin", help="Admin username for token")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--batch-size", type=int, default=BULK_MAX_ROWS)
+    args = parser.parse_args()
+
+    token = args.token or auth_handler.encode_token(user_id=args.admin)
+    rows = [to_student_payload(r, args.password) for r in read_rows(args.file)]
+    logger.info(f"Registering {len(rows)} students from {args.file}")
+
+    results = bulk_register(rows, args.url, token, args.batch_size)
+    failed = [r for r in results if not r["ok"]]
+    for r in failed:
+        logger.error(f"Row {r['index']} ({r['username']}): {r['error']}")
+    logger.info(f"Done: {len(results) - len(failed)} inserted, {len(failed)} failed")
@@ -63,3 +63,5 @@ events_collection = db["events"]
 records_collection = db["records"]
 # Room
 rooms_collection = db["rooms"]
+# Refresh Token (hashed)
+refresh_tokens_collection = db["refresh_tokens"]
@@ -12,6 +12,8 @@ class ErrorMsg:
     INVALID_STATUS_UPDATE_REQ = "Invalid application status update request."
     NOT_YOUR_AF = "Failed. Not your application."
     NO_AVAILABLE_SLOTS = "Failed. Not enough slots."
+    SERVER_BUSY = "Server is busy, please try again later."
+    INVALID_REFRESH_TOKEN = "Invalid or expired refresh token."
 
     @staticmethod
     def permission_denied_msg(username: str) -> str:
@@ -0,0 +1,149 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi import HTTPException
+from markkk.logger import logger
+from passlib.context import CryptContext
+
+from .error_msg import ErrorMsg as MSG
+
+# NOTE: must stay identical to AuthHandler.pwd_context
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _timed_call(fn: Callable, *args) -> Tuple[Any, float, float]:
+    """ Executed in worker process: return result with start & end timestamps """
+    start = time.time()
+    result = fn(*args)
+    return result, start, time.time()
+
+
+def _hash(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    return [_pwd_context.hash(p) for p in passwords]
+
+
+class PasswordHasher:
+    """
+    Run bcrypt hashing / verification in a dedicated process pool so that
+    it never blocks the event loop and can use multiple CPU cores.
+
+    - At most `max_workers` hashes run concurrently (one per worker process).
+    - At most `max_queue` hashes may be in flight (running + waiting),
+      further requests are rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None):
+        self.max_workers = max(
+            int(max_workers or os.environ.get("PASSWORD_HASH_WORKERS", 0))
+            or os.cpu_count()
+            or 1,
+            1,
+        )
+        self.max_queue = max(
+            int(max_queue or os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", 64)), 1
+        )
+        self._executor: ProcessPoolExecutor = None
+        self.pending = 0
+        # metrics
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: do not fork a process holding DB client threads & locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Password hashing pool started: {self.max_workers} workers")
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, fn: Callable, *args, count: int = 1) -> Any:
+        """ Run fn(*args) in the pool, `count` is the number of hashes it does """
+        if self.pending >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"Password hashing queue full ({self.pending} pending)")
+            raise HTTPException(
+                status_code=503, detail=MSG.SERVER_BUSY, headers={"Retry-After": "1"}
+            )
+
+        self.pending += 1
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_event_loop()
+            result, start, end = await loop.run_in_executor(
+                self.executor, _timed_call, fn, *args
+            )
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Password hashing failed: {e}")
+            raise HTTPException(status_code=500, detail=MSG.UNEXPECTED)
+        finally:
+            self.pending -= 1
+
+        queue_wait = max(start - submitted_at, 0.0)
+        latency = end - start
+        self.completed += count
+        self.total_queue_wait += queue_wait * count
+        self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency / count)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """ Hash a batch of passwords, spread evenly across all worker processes """
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.max_workers)  # ceiling division
+        chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+        results = await asyncio.gather(
+            *[self._run(_hash_many, chunk, count=len(chunk)) for chunk in chunks]
+        )
+        return [h for chunk_hashes in results for h in chunk_hashes]
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "avg_latency_ms": round(self.total_latency / completed * 1000, 3),
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+            "avg_queue_wait_ms": round(self.total_queue_wait / completed * 1000, 3),
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 3),
+        }
+
+
+password_hasher = PasswordHasher()
@@ -5,11 +5,14 @@ from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from markkk.logger import logger
 
+from .database import refresh_tokens_collection
+from .hashing import password_hasher
 from .routes import (
     application_periods,
     applications,
     auth,
     events,
+    metrics,
     records,
     rooms,
     students,
@@ -35,6 +38,7 @@ app.include_router(applications.router)
 app.include_router(events.router)
 app.include_router(records.router)
 app.include_router(rooms.router)
+app.include_router(metrics.router)
 
 
 # print timezone and current time
@@ -48,3 +52,20 @@ print()
 @app.get("/api")
 async def index():
     return {"Hello": "SUTD Housing Portal"}
+
+
+@app.on_event("startup")
+def create_refresh_token_indexes():
+    try:
+        refresh_tokens_collection.create_index("token_hash", unique=True)
+        refresh_tokens_collection.create_index("family")
+        refresh_tokens_collection.create_index("username")
+        # expire refresh tokens automatically
+        refresh_tokens_collection.create_index("expires_at", expireAfterSeconds=0)
+    except Exception as e:
+        logger.error(f"Failed to create refresh token indexes: {e}")
+
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
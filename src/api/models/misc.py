@@ -1,17 +1,47 @@
+from typing import List
+
 from markkk.logger import logger
 from pydantic import BaseModel
 
 
 class UserLoginResponse(BaseModel):
     token: str
+    refresh_token: str = None
     is_student: bool
     is_student_hg: bool
     is_admin: bool
     is_admin_write: bool
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
 class UserAccessResponse(BaseModel):
     is_student: bool
     is_student_hg: bool
     is_admin: bool
     is_admin_write: bool
+
+
+class Principal(UserAccessResponse):
+    """ Resolved roles of an authenticated user """
+
+    username: str
+
+    @property
+    def at_least_student_hg_write(self) -> bool:
+        return self.is_student_hg or self.is_admin_write
+
+
+class BulkRowResult(BaseModel):
+    index: int  # position of the row in the submitted batch
+    username: str = None
+    ok: bool
+    error: str = None
+
+
+class BulkRegistrationResponse(BaseModel):
+    inserted: int
+    failed: int
+    results: List[BulkRowResult]
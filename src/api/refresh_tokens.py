@@ -0,0 +1,112 @@
+import hashlib
+import os
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from markkk.logger import logger
+from pymongo import ReturnDocument
+
+from .async_database import refresh_tokens_collection
+from .error_msg import ErrorMsg as MSG
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRE_DAYS", 30))
+
+
+def _digest(refresh_token: str) -> str:
+    """
+    Refresh tokens are long random strings, a plain SHA-256 digest is enough
+    to store them safely, no key stretching required.
+    """
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def issue_refresh_token(username: str, family: str = None) -> str:
+    """
+    Create and store a new opaque refresh token for the given user.
+
+    Tokens rotated from the same login share the same `family`.
+    Only the digest of the token is stored, the document is removed by
+    MongoDB TTL index once `expires_at` has passed.
+    """
+    refresh_token = secrets.token_urlsafe(32)
+    _now = datetime.utcnow()
+    token_dict = {
+        "token_hash": _digest(refresh_token),
+        "username": username,
+        "family": family or uuid.uuid4().hex,
+        "used": False,
+        "created_at": _now,
+        "expires_at": _now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    }
+    try:
+        await refresh_tokens_collection.insert_one(token_dict)
+    except Exception as e:
+        logger.error(MSG.DB_UPDATE_ERROR)
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
+    return refresh_token
+
+
+async def rotate_refresh_token(refresh_token: str) -> Tuple[str, str]:
+    """
+    Consume a refresh token and issue its successor.
+
+    Return: (username, new refresh token)
+
+    Reusing an already consumed refresh token revokes its whole family,
+    as it indicates the token has been leaked.
+    """
+    token_hash = _digest(refresh_token)
+    try:
+        token_dict: Optional[
+            dict
+        ] = await refresh_tokens_collection.find_one_and_update(
+            filter={
+                "token_hash": token_hash,
+                "used": False,
+                "expires_at": {"$gt": datetime.utcnow()},
+            },
+            update={"$set": {"used": True}},
+            return_document=ReturnDocument.BEFORE,
+        )
+    except Exception as e:
+        logger.error(MSG.DB_UPDATE_ERROR)
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
+
+    if not token_dict:
+        await revoke_reused_refresh_token(token_hash)
+        raise HTTPException(status_code=401, detail=MSG.INVALID_REFRESH_TOKEN)
+
+    username: str = token_dict["username"]
+    return username, await issue_refresh_token(username, family=token_dict["family"])
+
+
+async def revoke_reused_refresh_token(token_hash: str) -> None:
+    try:
+        token_dict = await refresh_tokens_collection.find_one(
+            {"token_hash": token_hash, "used": True}, {"family": 1, "username": 1}
+        )
+        if token_dict:
+            logger.warning(
+                f"Refresh token reused, revoking token family of user: '{token_dict['username']}'"
+            )
+            await refresh_tokens_collection.delete_many(
+                {"family": token_dict["family"]}
+            )
+    except Exception as e:
+        logger.error(MSG.DB_UPDATE_ERROR)
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
+
+
+async def revoke_refresh_tokens_of_user(username: str) -> None:
+    try:
+        await refresh_tokens_collection.delete_many({"username": username})
+    except Exception as e:
+        logger.error(MSG.DB_UPDATE_ERROR)
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
@@ -4,13 +4,13 @@ from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException
 from markkk.logger import logger
 
-from ..database import *
+from ..async_database import *
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, convert_datetime_to_date
 from ..models.application import ApplicationForm, ApplicationPeriod, TimePeriod
 
 
-def validate_new_application(
+async def validate_new_application(
     target_AP_uid: str, student_id: str, stay_period: TimePeriod
 ) -> bool:
     """
@@ -24,7 +24,7 @@ def validate_new_application(
     """
     _now = datetime.now()
     try:
-        ap_dict = application_periods_collection.find_one({"uid": target_AP_uid})
+        ap_dict = await application_periods_collection.find_one({"uid": target_AP_uid})
         clean_dict(ap_dict)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -7,10 +7,11 @@ from pymongo import DESCENDING
 
 from ..access_utils import Access
 from ..auth import AuthHandler
-from ..database import *
+from ..async_database import *
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, convert_date_to_datetime
 from ..models.application import ApplicationPeriod, TimePeriod
+from ..models.misc import Principal
 from .application_helpers import (
     convert_from_applicable_periods,
     convert_to_applicable_periods,
@@ -23,22 +24,23 @@ auth_handler = AuthHandler()
 
 
 @router.get("/all", response_model=List[ApplicationPeriod])
-async def get_all_application_periods(username=Depends(auth_handler.auth_wrapper)):
+async def get_all_application_periods(principal: Principal = Depends(Access.principal)):
     """
     Get ALL Application Periods
 
     Require: Admin-read
     """
+    username = principal.username
 
     logger.debug(f"User({username}) fetching ALL ApplicationPeriods.")
-    permission_ok = Access.is_admin(username)
+    permission_ok = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     ap_list = []
     try:
-        for ap_dict in application_periods_collection.find().sort(
+        async for ap_dict in application_periods_collection.find().sort(
             "created_by", DESCENDING
         ):
             clean_dict(ap_dict)
@@ -66,7 +68,7 @@ async def get_active_application_periods(username=Depends(auth_handler.auth_wrap
     ap_list = []
     _now = datetime.now()
     try:
-        for ap_dict in application_periods_collection.find(
+        async for ap_dict in application_periods_collection.find(
             {
                 "application_window_open": {"$lt": _now},
                 "application_window_close": {"$gte": _now},
@@ -87,14 +89,15 @@ async def get_active_application_periods(username=Depends(auth_handler.auth_wrap
 
 @router.post("/", response_model=ApplicationPeriod, status_code=201)
 async def create_new_application_period(
-    ap: ApplicationPeriod, username=Depends(auth_handler.auth_wrapper)
+    ap: ApplicationPeriod, principal: Principal = Depends(Access.principal)
 ):
     """
     Create an ApplicationPeriod
 
     Require: Admin-write
     """
-    permission_ok = Access.is_admin_write(username)
+    username = principal.username
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -106,7 +109,9 @@ async def create_new_application_period(
     )
 
     try:
-        _inserted_id = application_periods_collection.insert_one(ap_dict).inserted_id
+        _inserted_id = (
+            await application_periods_collection.insert_one(ap_dict)
+        ).inserted_id
         logger.debug(
             f"New ApplicationPeriod inserted to DB with inserted_id: {_inserted_id}"
         )
@@ -120,20 +125,21 @@ async def create_new_application_period(
 
 @router.delete("/{uid}")
 async def delete_an_application_period(
-    uid: str, username=Depends(auth_handler.auth_wrapper)
+    uid: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Delete an ApplicationPeriod
 
     Require: Admin-write
     """
-    permission_ok = Access.is_admin_write(username)
+    username = principal.username
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        ap_info = application_periods_collection.find_one(filter={"uid": uid})
+        ap_info = await application_periods_collection.find_one(filter={"uid": uid})
         clean_dict(ap_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -144,7 +150,7 @@ async def delete_an_application_period(
         ref_count = ap_info.get("reference_count", -1)
         if ref_count == 0:
             try:
-                application_periods_collection.delete_one({"uid": uid})
+                await application_periods_collection.delete_one({"uid": uid})
             except Exception as e:
                 logger.error(MSG.DB_UPDATE_ERROR)
                 logger.error(e)
@@ -165,21 +171,22 @@ async def delete_an_application_period(
 
 @router.get("/{uid}", response_model=ApplicationPeriod)
 async def get_an_application_period(
-    uid: str, username=Depends(auth_handler.auth_wrapper)
+    uid: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Get an Application Period
 
     Require: Admin-read
     """
+    username = principal.username
     logger.debug(f"User({username}) requested to get ApplicationPeriod({uid}).")
-    permission_ok = Access.is_admin(username)
+    permission_ok = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        ap_info = application_periods_collection.find_one(filter={"uid": uid})
+        ap_info = await application_periods_collection.find_one(filter={"uid": uid})
         clean_dict(ap_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -7,10 +7,11 @@ from pymongo import ReturnDocument
 from ..access_utils import Access
 from ..auth import AuthHandler
 from ..constants import AFStatus
-from ..database import *
+from ..async_database import *
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, convert_date_to_datetime
 from ..models.application import ApplicationForm, ApplicationPeriod, TimePeriod
+from ..models.misc import Principal
 from .application_helpers import validate_new_application
 
 router = APIRouter(prefix="/api/applications", tags=["Housing Applications"])
@@ -18,22 +19,23 @@ auth_handler = AuthHandler()
 
 
 @router.get("/", response_model=List[ApplicationForm])
-async def get_all_applications(username=Depends(auth_handler.auth_wrapper)):
+async def get_all_applications(principal: Principal = Depends(Access.principal)):
     """
     Get all Application Forms
 
     Require: Admin-read
     """
+    username = principal.username
     logger.debug(f"User({username}) fetching all records info")
 
-    permission_ok: bool = Access.is_admin(username)
+    permission_ok: bool = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     application_list = []
     try:
-        for application in applications_collection.find():
+        async for application in applications_collection.find():
             clean_dict(application)
             application_list.append(application)
     except Exception as e:
@@ -46,23 +48,27 @@ async def get_all_applications(username=Depends(auth_handler.auth_wrapper)):
 
 @router.post("/", status_code=201, response_model=ApplicationForm)
 async def submit_application(
-    application_form: ApplicationForm, username=Depends(auth_handler.auth_wrapper)
+    application_form: ApplicationForm, principal: Principal = Depends(Access.principal)
 ):
     """
     Submit a new Application Form to database
 
     Require: Student-self or Admin-write
     """
+    username = principal.username
     logger.debug(f"User({username}) trying creating new Application.")
 
     # 0. check if student exists
     target_student: str = application_form.student_id
-    if not target_student or not Access.is_student(target_student):
+    if (
+        not target_student
+        or not (await Access.resolve_async(target_student)).is_student
+    ):
         logger.debug("Student does not exist.")
         raise HTTPException(status_code=404, detail=MSG.TARGET_ITEM_NOT_FOUND)
 
     # Check access
-    permission_ok = (username == target_student) or Access.is_admin_write(username)
+    permission_ok = (username == target_student) or principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -79,7 +85,7 @@ async def submit_application(
     # make sure only one application per student for an application period
     # validate stay period, cross check with allowable period
     AP_uid: str = application_form.application_period_uid
-    if not validate_new_application(AP_uid, target_student, stay_period):
+    if not await validate_new_application(AP_uid, target_student, stay_period):
         raise HTTPException(status_code=400, detail=MSG.INVALID_APPLICATION)
 
     # set values by this action
@@ -92,17 +98,19 @@ async def submit_application(
 
     # start database transaction
     try:
-        with client.start_session() as session:
-            with session.start_transaction():
+        async with client.start_session() as session:
+            async with session.start_transaction():
 
                 # insert application
-                _inserted_id = applications_collection.insert_one(
-                    document=application_dict,
-                    session=session,
+                _inserted_id = (
+                    await applications_collection.insert_one(
+                        document=application_dict,
+                        session=session,
+                    )
                 ).inserted_id
                 logger.debug(f"New Application inserted: {application_dict}")
                 # add application uid to student profile
-                _updated = students_collection.find_one_and_update(
+                _updated = await students_collection.find_one_and_update(
                     filter={"student_id": target_student},
                     # NOTE: use dot notation to update field in dict in a document
                     update={"$push": {"application_uids": application_form.uid}},
@@ -112,7 +120,7 @@ async def submit_application(
                 logger.debug(f"Student Updated: {str(_updated)}")
                 # increate application period reference count
                 # add application_form.uid to application map
-                _updated = application_periods_collection.find_one_and_update(
+                _updated = await application_periods_collection.find_one_and_update(
                     filter={"uid": AP_uid},
                     update={
                         "$inc": {"reference_count": 1},
@@ -135,17 +143,18 @@ async def submit_application(
 
 @router.get("/{uid}", response_model=ApplicationForm)
 async def get_an_application_info(
-    uid: str, username=Depends(auth_handler.auth_wrapper)
+    uid: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Get an ApplicationForm info
 
     Require: Student-self or Admin-read
     """
+    username = principal.username
     # Special case, check permission after getting item from DB
     logger.debug(f"User({username}) fetching record({uid}) info")
     try:
-        application_dict: dict = applications_collection.find_one({"uid": uid})
+        application_dict: dict = await applications_collection.find_one({"uid": uid})
         clean_dict(application_dict)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -157,7 +166,7 @@ async def get_an_application_info(
 
     # Student-self can access DisciplinaryRecord issued to himself/herself.
     application_owner = application_dict.get("student_id", "")
-    permission_ok = Access.is_admin(username)
+    permission_ok = principal.is_admin
     permission_ok = True if username == application_owner else permission_ok
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
@@ -182,20 +191,23 @@ async def update_application(
 
 
 @router.delete("/{uid}")
-async def delete_application(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def delete_application(
+    uid: str, principal: Principal = Depends(Access.principal)
+):
     """
     Delete an ApplicationForm info
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"{username} trying to delete an ApplicationForm")
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        application_dict = applications_collection.find_one(filter={"uid": uid})
+        application_dict = await applications_collection.find_one(filter={"uid": uid})
         owner_student = application_dict.get("student_id")
         AP_uid = application_dict.get("application_period_uid")
         clean_dict(application_dict)
@@ -208,12 +220,12 @@ async def delete_application(uid: str, username=Depends(auth_handler.auth_wrappe
         raise HTTPException(status_code=404, detail=MSG.TARGET_ITEM_NOT_FOUND)
 
     try:
-        with client.start_session() as session:
-            with session.start_transaction():
+        async with client.start_session() as session:
+            async with session.start_transaction():
                 # delete application
-                applications_collection.delete_one({"uid": uid})
+                await applications_collection.delete_one({"uid": uid}, session=session)
                 # remove application uid from student profile
-                _updated = students_collection.find_one_and_update(
+                _updated = await students_collection.find_one_and_update(
                     filter={"student_id": owner_student},
                     # NOTE: $pull Removes all array elements that match a specified query.
                     update={"$pull": {"application_uids": uid}},
@@ -223,7 +235,7 @@ async def delete_application(uid: str, username=Depends(auth_handler.auth_wrappe
                 logger.debug(f"Student Updated: {str(_updated)}")
                 # decrease application period reference count
                 # remove uid from application map
-                _updated = application_periods_collection.find_one_and_update(
+                _updated = await application_periods_collection.find_one_and_update(
                     filter={"uid": AP_uid},
                     update={
                         "$inc": {"reference_count": -1},
@@ -241,10 +253,10 @@ async def delete_application(uid: str, username=Depends(auth_handler.auth_wrappe
         raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
 
 
-def update_application_form_both_status(
+async def update_application_form_both_status(
     AF_uid: str, new_status: str = None, pre_status: List[str] = AFStatus.ALL
 ) -> dict:
-    return update_application_form_status(
+    return await update_application_form_status(
         AF_uid=AF_uid,
         new_internal_status=new_status,
         new_visible_status=new_status,
@@ -253,7 +265,7 @@ def update_application_form_both_status(
     )
 
 
-def update_application_form_status(
+async def update_application_form_status(
     AF_uid: str,
     new_internal_status: str = None,
     new_visible_status: str = None,
@@ -281,7 +293,9 @@ def update_application_form_status(
 
     # check target exists
     try:
-        application_dict = applications_collection.find_one(filter={"uid": AF_uid})
+        application_dict = await applications_collection.find_one(
+            filter={"uid": AF_uid}
+        )
         clean_dict(application_dict)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -330,10 +344,10 @@ def update_application_form_status(
         )
 
     try:
-        with client.start_session() as session:
-            with session.start_transaction():
+        async with client.start_session() as session:
+            async with session.start_transaction():
                 # delete application
-                _updated = applications_collection.find_one_and_update(
+                _updated = await applications_collection.find_one_and_update(
                     filter={"uid": AF_uid},
                     update={"$set": status_to_be_updated},
                     return_document=ReturnDocument.AFTER,
@@ -351,62 +365,72 @@ def update_application_form_status(
 
 
 @router.post("/{uid}/offer", response_model=ApplicationForm)
-async def approve_application(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def approve_application(
+    uid: str, principal: Principal = Depends(Access.principal)
+):
     """
     Approve an Application
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"{username} trying to offer (approve) an ApplicationForm")
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
-    _updated = update_application_form_both_status(uid, AFStatus.OFFER)
+    _updated = await update_application_form_both_status(uid, AFStatus.OFFER)
     return _updated
 
 
 @router.post("/{uid}/waitlist")
-async def waitlist_application(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def waitlist_application(
+    uid: str, principal: Principal = Depends(Access.principal)
+):
     """
     Waitlist an Application
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"{username} trying to waitlist an ApplicationForm")
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
-    _updated = update_application_form_both_status(uid, AFStatus.WAITLIST)
+    _updated = await update_application_form_both_status(uid, AFStatus.WAITLIST)
     return _updated
 
 
 @router.post("/{uid}/reject")
-async def reject_application(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def reject_application(
+    uid: str, principal: Principal = Depends(Access.principal)
+):
     """
     Reject an Application
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"{username} trying to reject an ApplicationForm")
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
-    _updated = update_application_form_both_status(uid, AFStatus.REJECT)
+    _updated = await update_application_form_both_status(uid, AFStatus.REJECT)
     return _updated
 
 
-def student_update_application_form_status(
+async def student_update_application_form_status(
     AF_uid: str, username: str, new_status: str, pre_status: List[str]
 ) -> dict:
     # Check access 1
+    principal = await Access.resolve_async(username)
     permission_ok = False
-    if Access.is_student(username) or Access.is_admin_write(username):
+    if principal.is_student or principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -414,9 +438,9 @@ def student_update_application_form_status(
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     # Check access 2: check if the application belongs to student
-    if Access.is_student(username):
+    if principal.is_student:
         try:
-            student_info = students_collection.find_one({"student_id": username})
+            student_info = await students_collection.find_one({"student_id": username})
             clean_dict(student_info)
         except Exception as e:
             logger.error(MSG.DB_QUERY_ERROR)
@@ -428,7 +452,7 @@ def student_update_application_form_status(
         if AF_uid not in student_application_uids:
             raise HTTPException(status_code=400, detail=MSG.NOT_YOUR_AF)
 
-    _updated = update_application_form_both_status(AF_uid, new_status, pre_status)
+    _updated = await update_application_form_both_status(AF_uid, new_status, pre_status)
     return _updated
 
 
@@ -440,7 +464,7 @@ async def student_accept_offer(uid: str, username=Depends(auth_handler.auth_wrap
     Require: Student-self or Admin-write
     """
     logger.debug(f"{username} trying to accept the offer in an ApplicationForm")
-    _updated = student_update_application_form_status(
+    _updated = await student_update_application_form_status(
         AF_uid=uid,
         username=username,
         new_status=AFStatus.ACCEPT,
@@ -457,7 +481,7 @@ async def student_decline_offer(uid: str, username=Depends(auth_handler.auth_wra
     Require: Student-self or Admin-write
     """
     logger.debug(f"{username} trying to decline the offer in an ApplicationForm")
-    _updated = student_update_application_form_status(
+    _updated = await student_update_application_form_status(
         AF_uid=uid,
         username=username,
         new_status=AFStatus.DECLINE,
@@ -476,7 +500,7 @@ async def student_withdraw_application(
     Require: Student-self or Admin-write
     """
     logger.debug(f"{username} trying to withdraw an ApplicationForm")
-    _updated = student_update_application_form_status(
+    _updated = await student_update_application_form_status(
         AF_uid=uid,
         username=username,
         new_status=AFStatus.WITHDRAW,
@@ -1,30 +1,53 @@
 # authentications
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Security
+from fastapi.security import HTTPAuthorizationCredentials
 from markkk.logger import logger
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
 
 from ..access_utils import Access
 from ..auth import AuthHandler
-from ..database import *
-from ..models.misc import UserAccessResponse, UserLoginResponse
+from ..async_database import *
+from ..error_msg import ErrorMsg as MSG
+from ..models.misc import (
+    BulkRegistrationResponse,
+    BulkRowResult,
+    Principal,
+    RefreshTokenRequest,
+    UserAccessResponse,
+    UserLoginResponse,
+)
 from ..models.student import Student
 from ..models.user import Admin, User
+from ..refresh_tokens import (
+    issue_refresh_token,
+    revoke_refresh_tokens_of_user,
+    rotate_refresh_token,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["User Authentication"])
 auth_handler = AuthHandler()
 
+BULK_MAX_ROWS = 5000  # max number of students per bulk registration request
+BULK_CHUNK_SIZE = 500  # number of documents per insert_many call
+
 
 @router.post("/register/user", status_code=201)
 async def register(new_user: User):
-    search_count = users_collection.count_documents({"username": new_user.username})
+    search_count = await users_collection.count_documents(
+        {"username": new_user.username}
+    )
     if search_count > 0:
         raise HTTPException(status_code=400, detail="Username is taken")
-    new_user.password = auth_handler.get_password_hash(new_user.password)
+    new_user.password = await auth_handler.get_password_hash_async(new_user.password)
 
     user_dict = dict(new_user.dict())
     try:
         # insert into database
-        users_collection.insert_one(user_dict)
+        await users_collection.insert_one(user_dict)
         logger.debug(f"New User inserted to DB: {new_user.username}")
     except Exception as e:
         logger.error(f"New User failed to be inserted to DB: {new_user.username}")
@@ -35,16 +58,19 @@ async def register(new_user: User):
 
 @router.post("/register/admin", status_code=201)
 async def register_admin(new_user: Admin):
-    search_count = users_collection.count_documents({"username": new_user.username})
+    search_count = await users_collection.count_documents(
+        {"username": new_user.username}
+    )
     if search_count > 0:
         raise HTTPException(status_code=400, detail="Username is taken")
-    new_user.password = auth_handler.get_password_hash(new_user.password)
+    new_user.password = await auth_handler.get_password_hash_async(new_user.password)
 
     user_dict = dict(new_user.dict())
     try:
         # insert into database
-        admins_collection.insert_one(user_dict)
-        users_collection.insert_one(user_dict)
+        await admins_collection.insert_one(user_dict)
+        await users_collection.insert_one(user_dict)
+        Access.invalidate(new_user.username)
         logger.debug(f"New Admin inserted to DB: {new_user.username}")
     except Exception as e:
         logger.error(f"New Admin failed to be inserted to DB: {new_user.username}")
@@ -55,18 +81,21 @@ async def register_admin(new_user: Admin):
 
 @router.post("/register/student", status_code=201)
 async def register_student(new_user: Student):
-    search_count = students_collection.count_documents({"username": new_user.username})
+    search_count = await students_collection.count_documents(
+        {"username": new_user.username}
+    )
     if search_count > 0:
         raise HTTPException(status_code=400, detail="Student already exists")
 
     # hash user password
-    new_user.password = auth_handler.get_password_hash(new_user.password)
+    new_user.password = await auth_handler.get_password_hash_async(new_user.password)
 
     user_dict = dict(new_user.dict())
     try:
         # insert into database
-        students_collection.insert_one(user_dict)
-        users_collection.insert_one(user_dict)
+        await students_collection.insert_one(user_dict)
+        await users_collection.insert_one(user_dict)
+        Access.invalidate(new_user.username)
         logger.debug(f"New Student inserted to DB: {new_user.username}")
     except Exception as e:
         logger.error(f"New Student failed to be inserted to DB: {new_user.username}")
@@ -75,43 +104,189 @@ async def register_student(new_user: Student):
     return
 
 
+async def insert_many_in_chunks(collection, documents: List[dict]) -> Dict[int, str]:
+    """
+    Insert documents with unordered insert_many calls of BULK_CHUNK_SIZE each.
+
+    Return: mapping of failed document index -> error message
+    """
+    errors: Dict[int, str] = {}
+    for offset in range(0, len(documents), BULK_CHUNK_SIZE):
+        chunk = documents[offset : offset + BULK_CHUNK_SIZE]
+        try:
+            await collection.insert_many(chunk, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                errors[offset + write_error["index"]] = write_error.get("errmsg")
+        except Exception as e:
+            logger.error(MSG.DB_UPDATE_ERROR)
+            logger.error(e)
+            for i in range(len(chunk)):
+                errors[offset + i] = MSG.DB_UPDATE_ERROR
+    return errors
+
+
+@router.post(
+    "/register/students", status_code=201, response_model=BulkRegistrationResponse
+)
+async def register_students_in_bulk(
+    students: List[dict] = Body(...),
+    principal: Principal = Depends(Access.principal),
+):
+    """
+    Register a batch of Students in one request, every row is validated
+    and inserted independently, a per-row report is returned.
+
+    Require: Admin-write
+    """
+    username = principal.username
+    logger.debug(f"User({username}) trying to register {len(students)} students.")
+    permission_ok = principal.is_admin_write
+    if not permission_ok:
+        logger.debug(MSG.permission_denied_msg(username))
+        raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
+
+    if len(students) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=400, detail=f"Too many rows, max {BULK_MAX_ROWS} per request."
+        )
+
+    results: List[BulkRowResult] = [
+        BulkRowResult(index=i, username=row.get("username"), ok=False)
+        for i, row in enumerate(students)
+    ]
+
+    # 0. validate every row
+    new_students: Dict[int, Student] = {}
+    for i, row in enumerate(students):
+        try:
+            new_students[i] = Student(**row)
+        except ValidationError as e:
+            results[i].error = str(e)
+
+    # 1. reject duplicated usernames, within the batch and against the database
+    seen = set()
+    for i, new_user in list(new_students.items()):
+        if new_user.username in seen:
+            results[i].error = "Duplicated username in batch"
+            new_students.pop(i)
+        seen.add(new_user.username)
+    try:
+        existing = await students_collection.find(
+            {"username": {"$in": list(seen)}}, {"_id": 0, "username": 1}
+        ).to_list()
+        existing = set(i["username"] for i in existing)
+    except Exception as e:
+        logger.error(MSG.DB_QUERY_ERROR)
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=MSG.DB_QUERY_ERROR)
+    for i, new_user in list(new_students.items()):
+        if new_user.username in existing:
+            results[i].error = "Student already exists"
+            new_students.pop(i)
+
+    # 2. hash passwords across the password hashing process pool
+    rows = list(new_students.keys())
+    hashed = await auth_handler.get_password_hashes_async(
+        [new_students[i].password for i in rows]
+    )
+    documents = []
+    for i, password_hash in zip(rows, hashed):
+        new_students[i].password = password_hash
+        documents.append(dict(new_students[i].dict()))
+
+    # 3. insert students, then users for the successfully inserted students
+    errors = await insert_many_in_chunks(students_collection, documents)
+    inserted = []
+    for n, (i, doc) in enumerate(zip(rows, documents)):
+        if n in errors:
+            results[i].error = errors[n]
+        else:
+            inserted.append((i, doc))
+    errors = await insert_many_in_chunks(users_collection, [doc for _, doc in inserted])
+    for n, (i, doc) in enumerate(inserted):
+        if n in errors:
+            results[i].error = errors[n]
+        else:
+            results[i].ok = True
+            Access.invalidate(doc["username"])
+
+    num_inserted = sum(1 for r in results if r.ok)
+    logger.debug(f"Bulk registration: {num_inserted}/{len(results)} students inserted")
+    return {
+        "inserted": num_inserted,
+        "failed": len(results) - num_inserted,
+        "results": results,
+    }
+
+
 @router.post("/login", response_model=UserLoginResponse)
 async def login(auth_details: User):
     try:
-        user = users_collection.find_one({"username": auth_details.username})
+        user = await users_collection.find_one({"username": auth_details.username})
     except Exception as e:
         logger.error("Failed to query user from database.")
         logger.error(e)
         raise HTTPException(status_code=500, detail="Databse Error.")
-    if not user or not auth_handler.verify_password(
+    if not user or not await auth_handler.verify_password_async(
         auth_details.password, user["password"]
     ):
         raise HTTPException(status_code=401, detail="Invalid username and/or password")
-    token = auth_handler.encode_token(auth_details.username)
-    logger.debug(f"New JWT token generated for user: '{auth_details.username}'")
-    is_student = Access.is_student(auth_details.username)
-    is_student_hg = Access.is_student_hg(auth_details.username)
-    is_admin = Access.is_admin(auth_details.username)
-    is_admin_write = Access.is_admin_write(auth_details.username)
+
+    return await issue_tokens(auth_details.username)
+
+
+@router.post("/refresh", response_model=UserLoginResponse)
+async def refresh(refresh_request: RefreshTokenRequest):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    The submitted refresh token is consumed (rotated).
+
+    Require: A valid refresh token
+    """
+    username, refresh_token = await rotate_refresh_token(refresh_request.refresh_token)
+    logger.debug(f"Refresh token rotated for user: '{username}'")
+    return await issue_tokens(username, refresh_token)
+
+
+async def issue_tokens(username: str, refresh_token: str = None) -> dict:
+    """ Issue a new access token (and a new refresh token if none given) """
+    principal = await Access.resolve_async(username)
+    roles = principal.dict(exclude={"username"}) if auth_handler.ROLE_CLAIMS else None
+    token = auth_handler.encode_token(username, roles=roles)
+    logger.debug(f"New JWT token generated for user: '{username}'")
+    if refresh_token is None:
+        refresh_token = await issue_refresh_token(username)
 
     return {
         "token": token,
-        "is_student": is_student,
-        "is_student_hg": is_student_hg,
-        "is_admin": is_admin,
-        "is_admin_write": is_admin_write,
+        "refresh_token": refresh_token,
+        "is_student": principal.is_student,
+        "is_student_hg": principal.is_student_hg,
+        "is_admin": principal.is_admin,
+        "is_admin_write": principal.is_admin_write,
     }
 
 
 @router.get("/access", response_model=UserAccessResponse)
-def check_user_type(username=Depends(auth_handler.auth_wrapper)):
-    is_student = Access.is_student(username)
-    is_student_hg = Access.is_student_hg(username)
-    is_admin = Access.is_admin(username)
-    is_admin_write = Access.is_admin_write(username)
+async def check_user_type(principal: Principal = Depends(Access.principal)):
     return {
-        "is_student": is_student,
-        "is_student_hg": is_student_hg,
-        "is_admin": is_admin,
-        "is_admin_write": is_admin_write,
+        "is_student": principal.is_student,
+        "is_student_hg": principal.is_student_hg,
+        "is_admin": principal.is_admin,
+        "is_admin_write": principal.is_admin_write,
     }
+
+
+@router.post("/logout")
+async def logout(auth: HTTPAuthorizationCredentials = Security(AuthHandler.security)):
+    """
+    Revoke the bearer token of this request and all refresh tokens of the user
+
+    Require: Any authenticated user
+    """
+    username = auth_handler.decode_token(auth.credentials)
+    auth_handler.revoke_token(auth.credentials)
+    await revoke_refresh_tokens_of_user(username)
+    logger.debug(f"JWT token and refresh tokens revoked for user: '{username}'")
+    return
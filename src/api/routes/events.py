@@ -7,10 +7,11 @@ from pymongo import ReturnDocument
 
 from ..access_utils import Access
 from ..auth import AuthHandler
-from ..database import *
+from ..async_database import *
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, deduct_list_from_list, remove_none_value_keys
 from ..models.event import Event, EventEditableInfo
+from ..models.misc import Principal
 
 router = APIRouter(prefix="/api/events", tags=["Housing Events"])
 auth_handler = AuthHandler()
@@ -33,7 +34,7 @@ async def get_list_of_events(
     try:
         for uid in event_uids:
             if isinstance(uid, str):
-                event_dict: dict = events_collection.find_one({"uid": uid})
+                event_dict: dict = await events_collection.find_one({"uid": uid})
                 if event_dict:
                     clean_dict(event_dict)
                     event_info_list.append(event_dict)
@@ -56,7 +57,7 @@ async def get_all_events(username=Depends(auth_handler.auth_wrapper)):
     logger.debug(f"User({username}) fetching all events info")
     event_info_list = []
     try:
-        for event_dict in events_collection.find().sort("start_time"):
+        async for event_dict in events_collection.find().sort("start_time"):
             clean_dict(event_dict)
             event_info_list.append(event_dict)
     except Exception as e:
@@ -78,9 +79,9 @@ async def get_upcoming_events(username=Depends(auth_handler.auth_wrapper)):
     event_info_list = []
     _now = datetime.now()
     try:
-        for event_dict in events_collection.find({"start_time": {"$gte": _now}}).sort(
-            "start_time"
-        ):
+        async for event_dict in events_collection.find(
+            {"start_time": {"$gte": _now}}
+        ).sort("start_time"):
             clean_dict(event_dict)
             event_info_list.append(event_dict)
     except Exception as e:
@@ -93,16 +94,17 @@ async def get_upcoming_events(username=Depends(auth_handler.auth_wrapper)):
 
 @router.post("/", status_code=201, response_model=Event)
 async def create_an_event(
-    new_event: Event, username=Depends(auth_handler.auth_wrapper)
+    new_event: Event, principal: Principal = Depends(Access.principal)
 ):
     """
     Create an Event
 
     Require: Student-HG or Admin-write
     """
+    username = principal.username
     logger.debug(f"User({username}) trying creating new Event.")
     # Check access
-    permission_ok = Access.at_least_student_hg_write(username)
+    permission_ok = principal.at_least_student_hg_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -110,9 +112,9 @@ async def create_an_event(
     new_event.created_by = str(username)
     event_dict = dict(new_event.dict())
     try:
-        _inserted_id = events_collection.insert_one(event_dict).inserted_id
+        _inserted_id = (await events_collection.insert_one(event_dict)).inserted_id
         logger.debug(f"New Event inserted to DB with inserted_id: {_inserted_id}")
-        _event = events_collection.find_one({"_id": _inserted_id})
+        _event = await events_collection.find_one({"_id": _inserted_id})
         clean_dict(_event)
         logger.debug(f"New Event info: {_event}")
         return _event
@@ -131,7 +133,7 @@ async def get_an_event(uid: str, username=Depends(auth_handler.auth_wrapper)):
     """
     logger.debug(f"User({username}) fetching event({uid}) info")
     try:
-        event_dict: dict = events_collection.find_one({"uid": uid})
+        event_dict: dict = await events_collection.find_one({"uid": uid})
         clean_dict(event_dict)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -148,23 +150,24 @@ async def get_an_event(uid: str, username=Depends(auth_handler.auth_wrapper)):
 async def update_an_event(
     uid: str,
     event_editable_info: EventEditableInfo,
-    username=Depends(auth_handler.auth_wrapper),
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Update an Event info
 
     Require: Student-HG or Admin-write
     """
+    username = principal.username
     logger.debug(f"User({username}) trying updating Event({uid}) info.")
     # Check access
     permission_ok = False
 
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
-    if Access.is_student_hg(username):
+    if principal.is_student_hg:
         try:
-            event_dict: dict = events_collection.find_one({"uid": uid})
+            event_dict: dict = await events_collection.find_one({"uid": uid})
         except Exception as e:
             logger.error(MSG.DB_QUERY_ERROR)
             logger.error(e)
@@ -181,7 +184,7 @@ async def update_an_event(
     event_dict = dict(event_editable_info.dict())
     remove_none_value_keys(event_dict)
     try:
-        updated = events_collection.find_one_and_update(
+        updated = await events_collection.find_one_and_update(
             filter={"uid": uid},
             update={"$set": event_dict},
             return_document=ReturnDocument.AFTER,
@@ -201,7 +204,7 @@ async def update_an_event(
 
 
 @router.delete("/{uid}")
-async def delete_an_event(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def delete_an_event(uid: str, principal: Principal = Depends(Access.principal)):
     """
     Delete an Event.
 
@@ -209,15 +212,15 @@ async def delete_an_event(uid: str, username=Depends(auth_handler.auth_wrapper))
 
     Require: HG or Admin-write
     """
-
+    username = principal.username
     logger.debug(f"User({username}) trying to delete Event({uid}).")
-    permission_ok = Access.is_student_hg(username) or Access.is_admin_write(username)
+    permission_ok = principal.is_student_hg or principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        event_info = events_collection.find_one(filter={"uid": uid})
+        event_info = await events_collection.find_one(filter={"uid": uid})
         clean_dict(event_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -235,7 +238,7 @@ async def delete_an_event(uid: str, username=Depends(auth_handler.auth_wrapper))
         raise HTTPException(status_code=400, detail=MSG.DEL_REF_COUNT_ERR)
 
     try:
-        _DeleteResult = events_collection.delete_one({"uid": uid})
+        _DeleteResult = await events_collection.delete_one({"uid": uid})
     except Exception as e:
         logger.error(MSG.DB_UPDATE_ERROR)
         logger.error(e)
@@ -250,19 +253,22 @@ async def delete_an_event(uid: str, username=Depends(auth_handler.auth_wrapper))
 
 @router.post("/{uid}/signup", response_model=Event)
 async def register_students_for_event(
-    uid: str, student_id_list: List[str], username=Depends(auth_handler.auth_wrapper)
+    uid: str,
+    student_id_list: List[str],
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Sign a list of Students up for a specific event
 
     This is done by student themselves, hence, len(student_id_list) == 1
     """
+    username = principal.username
     logger.debug(f"User({username}) trying to sign up Event({uid}).")
     permission_ok = False
     if len(student_id_list) == 1:
         permission_ok = student_id_list[0] == username
 
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -271,7 +277,7 @@ async def register_students_for_event(
 
     # 0. find the event
     try:
-        event_info = events_collection.find_one(filter={"uid": uid})
+        event_info = await events_collection.find_one(filter={"uid": uid})
         clean_dict(event_info)
     except Exception as e:
         logger.error(MSG.DB_UPDATE_ERROR)
@@ -287,7 +293,7 @@ async def register_students_for_event(
         if not isinstance(student_id, str):
             continue
         try:
-            info = students_collection.find_one(
+            info = await students_collection.find_one(
                 filter={"student_id": student_id},
             )
             if info:
@@ -309,7 +315,7 @@ async def register_students_for_event(
 
     # 3. add them into event's sign up list
     try:
-        updated = events_collection.find_one_and_update(
+        updated = await events_collection.find_one_and_update(
             filter={"uid": uid},
             update={"$push": {"signups": {"$each": validated_students}}},
             return_document=ReturnDocument.AFTER,
@@ -331,7 +337,7 @@ async def register_students_for_event(
             # NOTE: push operator
             # push may add duplicated value into array
             # https://docs.mongodb.com/manual/reference/operator/update/push/#up._S_push
-            _updated = students_collection.find_one_and_update(
+            _updated = await students_collection.find_one_and_update(
                 filter={"student_id": student_id},
                 update={"$push": {"registered_events": uid}},
                 return_document=ReturnDocument.AFTER,
@@ -347,19 +353,22 @@ async def register_students_for_event(
 
 @router.delete("/{uid}/signup", response_model=Event)
 async def deregister_students_for_event(
-    uid: str, student_id_list: List[str], username=Depends(auth_handler.auth_wrapper)
+    uid: str,
+    student_id_list: List[str],
+    principal: Principal = Depends(Access.principal),
 ):
     """
     deregister a list of Students for a specific event
 
     This can be done by self, admin-write, usually len(student_id_list) == 1
     """
+    username = principal.username
     logger.debug(f"User({username}) trying to de-register Event({uid}).")
     permission_ok = False
     if len(student_id_list) == 1:
         permission_ok = student_id_list[0] == username
 
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -372,7 +381,7 @@ async def deregister_students_for_event(
         if not isinstance(student_id, str):
             continue
         try:
-            info = students_collection.find_one(
+            info = await students_collection.find_one(
                 filter={"student_id": student_id},
             )
             if info:
@@ -387,7 +396,7 @@ async def deregister_students_for_event(
     # 1. remove them from event's sign up list
     try:
         # get event
-        event_info = events_collection.find_one(
+        event_info = await events_collection.find_one(
             filter={"uid": uid},
         )
         logger.debug(f"Before update: {str(event_info)}")
@@ -395,7 +404,7 @@ async def deregister_students_for_event(
         # reduce list
         deduct_list_from_list(_signups, validated_students)
         # update event signups
-        event_info = events_collection.find_one_and_update(
+        event_info = await events_collection.find_one_and_update(
             filter={"uid": uid},
             update={"$set": {"signups": _signups}},
             return_document=ReturnDocument.AFTER,
@@ -417,7 +426,7 @@ async def deregister_students_for_event(
             # NOTE: Pull operator
             # pull will remove all items in the array matching the value
             # https://docs.mongodb.com/manual/reference/operator/update/pull/#up._S_pull
-            _updated = students_collection.find_one_and_update(
+            _updated = await students_collection.find_one_and_update(
                 filter={"student_id": student_id},
                 update={"$pull": {"registered_events": uid}},
                 return_document=ReturnDocument.AFTER,
@@ -433,15 +442,18 @@ async def deregister_students_for_event(
 
 @router.post("/{uid}/attend", response_model=Event)
 async def add_students_attendance_for_event(
-    uid: str, student_id_list: List[str], username=Depends(auth_handler.auth_wrapper)
+    uid: str,
+    student_id_list: List[str],
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Add a list of Students's attendence for a specific event
 
     Require: HG or Admin-write, usually len(student_id_list) >= 1
     """
+    username = principal.username
     logger.debug(f"User({username}) trying to add attendance for Event({uid}).")
-    permission_ok = Access.is_admin_write(username) or Access.is_student_hg(username)
+    permission_ok = principal.is_admin_write or principal.is_student_hg
 
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
@@ -453,7 +465,7 @@ async def add_students_attendance_for_event(
         if not isinstance(student_id, str):
             continue
         try:
-            info = students_collection.find_one(
+            info = await students_collection.find_one(
                 filter={"student_id": student_id},
             )
             if info:
@@ -468,7 +480,7 @@ async def add_students_attendance_for_event(
     # 1. Add them into event's attendance list
     try:
         # get event
-        event_info = events_collection.find_one(
+        event_info = await events_collection.find_one(
             filter={"uid": uid},
         )
         logger.debug(f"Before update: {str(event_info)}")
@@ -476,7 +488,7 @@ async def add_students_attendance_for_event(
         # union list
         _attendance = list(set(_attendance + validated_students))
         # update event signups
-        event_info = events_collection.find_one_and_update(
+        event_info = await events_collection.find_one_and_update(
             filter={"uid": uid},
             update={"$set": {"attendance": _attendance}},
             return_document=ReturnDocument.AFTER,
@@ -495,7 +507,7 @@ async def add_students_attendance_for_event(
     # 2. add event uid to student attended_events list
     for student_id in validated_students:
         try:
-            _updated = students_collection.find_one_and_update(
+            _updated = await students_collection.find_one_and_update(
                 filter={"student_id": student_id},
                 update={"$push": {"attended_events": uid}},
                 return_document=ReturnDocument.AFTER,
@@ -511,15 +523,18 @@ async def add_students_attendance_for_event(
 
 @router.delete("/{uid}/attend", response_model=Event)
 async def remove_students_attendance_for_event(
-    uid: str, student_id_list: List[str], username=Depends(auth_handler.auth_wrapper)
+    uid: str,
+    student_id_list: List[str],
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Remove a list of Students's attendence for a specific event
 
     Require: HG or Admin-write, usually len(student_id_list) >= 1
     """
+    username = principal.username
     logger.debug(f"User({username}) trying to remove attendance for Event({uid}).")
-    permission_ok = Access.is_admin_write(username) or Access.is_student_hg(username)
+    permission_ok = principal.is_admin_write or principal.is_student_hg
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -530,7 +545,7 @@ async def remove_students_attendance_for_event(
         if not isinstance(student_id, str):
             continue
         try:
-            info = students_collection.find_one(
+            info = await students_collection.find_one(
                 filter={"student_id": student_id},
             )
             if info:
@@ -545,7 +560,7 @@ async def remove_students_attendance_for_event(
     # 1. Remove them from event's attendance list
     try:
         # get event
-        event_info = events_collection.find_one(
+        event_info = await events_collection.find_one(
             filter={"uid": uid},
         )
         logger.debug(f"Before update: {str(event_info)}")
@@ -553,7 +568,7 @@ async def remove_students_attendance_for_event(
         # reduce list
         deduct_list_from_list(_attendance, validated_students)
         # update event signups
-        event_info = events_collection.find_one_and_update(
+        event_info = await events_collection.find_one_and_update(
             filter={"uid": uid},
             update={"$set": {"attendance": _attendance}},
             return_document=ReturnDocument.AFTER,
@@ -573,7 +588,7 @@ async def remove_students_attendance_for_event(
     # 2. add event uid to student attended_events list
     for student_id in validated_students:
         try:
-            _updated = students_collection.find_one_and_update(
+            _updated = await students_collection.find_one_and_update(
                 filter={"student_id": student_id},
                 update={"$pull": {"attended_events": uid}},
                 return_document=ReturnDocument.AFTER,
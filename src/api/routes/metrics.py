@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException
+from markkk.logger import logger
+
+from ..access_utils import Access
+from ..auth import AuthHandler
+from ..error_msg import ErrorMsg as MSG
+from ..hashing import password_hasher
+from ..models.misc import Principal
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+async def get_metrics(principal: Principal = Depends(Access.principal)):
+    """
+    Get runtime metrics of this API worker process
+
+    Require: Admin-read
+    """
+    username = principal.username
+    logger.debug(f"User({username}) fetching runtime metrics")
+    permission_ok = principal.is_admin
+    if not permission_ok:
+        logger.debug(MSG.permission_denied_msg(username))
+        raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
+
+    return {
+        "access_cache": Access.cache.stats(),
+        "token_cache": AuthHandler.token_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+    }
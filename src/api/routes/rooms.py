@@ -6,9 +6,10 @@ from pymongo import ReturnDocument
 
 from ..access_utils import Access
 from ..auth import AuthHandler
-from ..database import rooms_collection
+from ..async_database import rooms_collection
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, remove_none_value_keys
+from ..models.misc import Principal
 from ..models.room import Room, RoomProfile
 
 router = APIRouter(prefix="/api/rooms", tags=["Rooms"])
@@ -16,22 +17,23 @@ auth_handler = AuthHandler()
 
 
 @router.get("/", response_model=List[Room])
-async def get_all_rooms(username=Depends(auth_handler.auth_wrapper)):
+async def get_all_rooms(principal: Principal = Depends(Access.principal)):
     """
     Get all Rooms
 
     Require: Admin-read
     """
+    username = principal.username
     logger.debug(f"User({username}) fetching all Rooms info")
 
-    permission_ok: bool = Access.is_admin(username)
+    permission_ok: bool = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     room_list = []
     try:
-        for r in rooms_collection.find():
+        async for r in rooms_collection.find():
             clean_dict(r)
             room_list.append(r)
     except Exception as e:
@@ -43,22 +45,23 @@ async def get_all_rooms(username=Depends(auth_handler.auth_wrapper)):
 
 
 @router.post("/", status_code=201, response_model=Room)
-async def add_room(new_room: Room, username=Depends(auth_handler.auth_wrapper)):
+async def add_room(new_room: Room, principal: Principal = Depends(Access.principal)):
     """
     Add a new Room to database
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"User({username}) trying add new Room.")
 
-    permission_ok: bool = Access.is_admin_write(username)
+    permission_ok: bool = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     room_dict = dict(new_room.dict())
     try:
-        _inserted_id = rooms_collection.insert_one(room_dict).inserted_id
+        _inserted_id = (await rooms_collection.insert_one(room_dict)).inserted_id
         logger.debug(f"New Room inserted to DB with inserted_id: {_inserted_id}")
     except Exception as e:
         logger.error(MSG.DB_UPDATE_ERROR)
@@ -71,21 +74,22 @@ async def add_room(new_room: Room, username=Depends(auth_handler.auth_wrapper)):
 
 
 @router.get("/{uid}", response_model=Room)
-async def get_room_info(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def get_room_info(uid: str, principal: Principal = Depends(Access.principal)):
     """
     Get a Room Info
 
     Require: Admin-read
     """
+    username = principal.username
     logger.debug(f"User({username}) fetching all Rooms info")
 
-    permission_ok: bool = Access.is_admin(username)
+    permission_ok: bool = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        room_info = rooms_collection.find_one({"uid": uid})
+        room_info = await rooms_collection.find_one({"uid": uid})
         clean_dict(room_info)
 
     except Exception as e:
@@ -97,21 +101,22 @@ async def get_room_info(uid: str, username=Depends(auth_handler.auth_wrapper)):
 
 
 @router.delete("/{uid}")
-async def delete_a_room(uid: str, username=Depends(auth_handler.auth_wrapper)):
+async def delete_a_room(uid: str, principal: Principal = Depends(Access.principal)):
     """
     Delete a Room from database
 
     Require: Admin-write
     """
+    username = principal.username
     logger.debug(f"{username} trying to delete a Room")
 
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        rooms_collection.delete_one({"uid": uid})
+        await rooms_collection.delete_one({"uid": uid})
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
         logger.error(e)
@@ -6,12 +6,13 @@ from pymongo import ReturnDocument
 
 from ..access_utils import Access
 from ..auth import AuthHandler
-from ..database import *
+from ..async_database import *
 from ..error_msg import ErrorMsg as MSG
 from ..functional import clean_dict, remove_none_value_keys
 from ..models.application import ApplicationForm, ApplicationPeriod, TimePeriod
 from ..models.event import Event
 from ..models.lifestyle import LifestyleProfile
+from ..models.misc import Principal
 from ..models.record import DisciplinaryRecord
 from ..models.room import Room, RoomProfile
 from ..models.student import (
@@ -26,15 +27,16 @@ auth_handler = AuthHandler()
 
 @router.get("/")
 async def get_all_student_info(
-    username=Depends(auth_handler.auth_wrapper), num: int = 30
+    principal: Principal = Depends(Access.principal), num: int = 30
 ):
     """
     Get all student info
 
     Require: Admin-read
     """
+    username = principal.username
     logger.debug(f"User({username}) trying fetching all students info.")
-    permission_ok: bool = Access.is_admin(username)
+    permission_ok: bool = principal.is_admin
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -42,7 +44,7 @@ async def get_all_student_info(
     student_info_list = []
     count = 0
     try:
-        for student_info in students_collection.find():
+        async for student_info in students_collection.find():
             count += 1
             clean_dict(student_info)
             student_info_list.append(student_info)
@@ -58,17 +60,18 @@ async def get_all_student_info(
 
 @router.get("/{student_id}", response_model=StudentProfile)
 async def get_a_student_info(
-    student_id: str, username=Depends(auth_handler.auth_wrapper)
+    student_id: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Set a particular Student info
 
     Require: Student-self or Admin-read
     """
+    username = principal.username
 
     logger.debug(f"User({username}) trying fetching student({student_id}) info.")
     permission_ok = False
-    if student_id == username or Access.is_admin(username):
+    if student_id == username or principal.is_admin:
         permission_ok = True
 
     if not permission_ok:
@@ -76,7 +79,7 @@ async def get_a_student_info(
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        student_info = students_collection.find_one({"student_id": student_id})
+        student_info = await students_collection.find_one({"student_id": student_id})
         clean_dict(student_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -94,17 +97,18 @@ async def get_a_student_info(
 async def update_a_student_profile(
     student_id: str,
     student_editable_profile: StudentEditableProfile,
-    username=Depends(auth_handler.auth_wrapper),
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Update (Overwrite) a particular Student info
 
     Require: Student-self or Admin-write
     """
+    username = principal.username
     permission_ok = False
     if username == student_id:
         permission_ok = True
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -118,7 +122,7 @@ async def update_a_student_profile(
         # NOTE: there is a potential bug here, need to distinguish cases where
         # A: user wants to clear certain field (supply 'None' as new value)
         # B: user wants to preserve the value of certain field (Not changing anything, so supplying 'None')
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": student_update_dict},
             return_document=ReturnDocument.AFTER,
@@ -141,12 +145,13 @@ async def update_a_student_profile(
 async def update_a_student_identity(
     student_id: str,
     student_identity_profile: StudentIdentityProfile,
-    username=Depends(auth_handler.auth_wrapper),
+    principal: Principal = Depends(Access.principal),
 ):
+    username = principal.username
     logger.debug(
         f"User({username}) trying to update Student({student_id})'s identity profile."
     )
-    permission_ok = Access.is_admin_write(username)
+    permission_ok = principal.is_admin_write
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
@@ -155,7 +160,7 @@ async def update_a_student_identity(
     remove_none_value_keys(identity_dict)
 
     try:
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": identity_dict},
             return_document=ReturnDocument.AFTER,
@@ -175,15 +180,16 @@ async def update_a_student_identity(
 
 @router.put("/{student_id}/set_hg")
 async def set_a_student_as_hg(
-    student_id: str, username=Depends(auth_handler.auth_wrapper)
+    student_id: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Set a Student as House Guardian
 
     Require: Admin-write
     """
+    username = principal.username
     permission_ok = False
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -191,7 +197,7 @@ async def set_a_student_as_hg(
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": {"is_house_guardian": True}},
             return_document=ReturnDocument.AFTER,
@@ -203,6 +209,9 @@ async def set_a_student_as_hg(
         logger.error(e)
         raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
 
+    # roles changed, drop cached roles of this student
+    Access.invalidate(student_id)
+
     if updated:
         logger.debug(f"Updated: {updated}")
         return updated
@@ -212,15 +221,16 @@ async def set_a_student_as_hg(
 
 @router.put("/{student_id}/revoke_sg")
 async def revoke_a_student_as_hg(
-    student_id: str, username=Depends(auth_handler.auth_wrapper)
+    student_id: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Revoke a Student as House Guardian
 
     Require: Admin-write
     """
+    username = principal.username
     permission_ok = False
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
 
     if not permission_ok:
@@ -228,7 +238,7 @@ async def revoke_a_student_as_hg(
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     try:
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": {"is_house_guardian": False}},
             return_document=ReturnDocument.AFTER,
@@ -240,6 +250,9 @@ async def revoke_a_student_as_hg(
         logger.error(e)
         raise HTTPException(status_code=500, detail=MSG.DB_UPDATE_ERROR)
 
+    # roles changed, drop cached roles of this student
+    Access.invalidate(student_id)
+
     if updated:
         logger.debug(f"Updated: {updated}")
         return updated
@@ -251,17 +264,18 @@ async def revoke_a_student_as_hg(
 async def update_one_room_profile(
     student_id: str,
     room_profile: RoomProfile,
-    username=Depends(auth_handler.auth_wrapper),
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Update (Overwrite) a student's prefered Room Profile
 
     Require: Student-self or Admin-write
     """
+    username = principal.username
     permission_ok = False
     if username == student_id:
         permission_ok = True
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
@@ -269,7 +283,7 @@ async def update_one_room_profile(
 
     data = dict(room_profile.dict())
     try:
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": {"preference_room": data}},
             return_document=ReturnDocument.AFTER,
@@ -291,17 +305,18 @@ async def update_one_room_profile(
 async def update_one_lifestyle_profile(
     student_id: str,
     lifestyle_profile: LifestyleProfile,
-    username=Depends(auth_handler.auth_wrapper),
+    principal: Principal = Depends(Access.principal),
 ):
     """
     Update (Overwrite) a student's prefered Lifestyle Profile
 
     Require: Student-self or Admin-write
     """
+    username = principal.username
     permission_ok = False
     if username == student_id:
         permission_ok = True
-    if Access.is_admin_write(username):
+    if principal.is_admin_write:
         permission_ok = True
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
@@ -309,7 +324,7 @@ async def update_one_lifestyle_profile(
 
     data = dict(lifestyle_profile.dict())
     try:
-        updated = students_collection.find_one_and_update(
+        updated = await students_collection.find_one_and_update(
             filter={"student_id": student_id},
             update={"$set": {"preference_lifestyle": data}},
             return_document=ReturnDocument.AFTER,
@@ -339,7 +354,7 @@ async def get_student_participated_events(
     logger.debug(f"User({username}) fetching student({student_id})'s Event list.")
 
     try:
-        student_info = students_collection.find_one({"student_id": student_id})
+        student_info = await students_collection.find_one({"student_id": student_id})
         clean_dict(student_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -360,7 +375,7 @@ async def get_student_participated_events(
     try:
         for uid in event_uids:
             if isinstance(uid, str):
-                event_dict: dict = events_collection.find_one({"uid": uid})
+                event_dict: dict = await events_collection.find_one({"uid": uid})
                 clean_dict(event_dict)
                 if event_dict:
                     event_info_list.append(event_dict)
@@ -374,25 +389,26 @@ async def get_student_participated_events(
 
 @router.get("/{student_id}/records", response_model=List[DisciplinaryRecord])
 async def get_student_disciplinary_records(
-    student_id: str, username=Depends(auth_handler.auth_wrapper)
+    student_id: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Get all DisciplinaryRecords that belong to the particular student
 
     Require: Student-self or Admin-read
     """
+    username = principal.username
     logger.debug(
         f"User({username}) trying fetching Student({student_id})'s DisciplinaryRecords"
     )
 
-    permission_ok = Access.is_admin(username) or (username == student_id)
+    permission_ok = principal.is_admin or (username == student_id)
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     # get DisciplinaryRecord uids from student profile
     try:
-        student_info = students_collection.find_one({"student_id": student_id})
+        student_info = await students_collection.find_one({"student_id": student_id})
         clean_dict(student_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -412,7 +428,7 @@ async def get_student_disciplinary_records(
     try:
         for uid in record_uids:
             if isinstance(uid, str):
-                _record_dict: dict = records_collection.find_one({"uid": uid})
+                _record_dict: dict = await records_collection.find_one({"uid": uid})
                 clean_dict(_record_dict)
                 if _record_dict:
                     event_info_list.append(_record_dict)
@@ -429,25 +445,26 @@ async def get_student_disciplinary_records(
 
 @router.get("/{student_id}/applications", response_model=Dict[str, ApplicationForm])
 async def get_student_submitted_applications(
-    student_id: str, username=Depends(auth_handler.auth_wrapper)
+    student_id: str, principal: Principal = Depends(Access.principal)
 ):
     """
     Get a list of ApplicationForm that the student has submitted.
 
     Require: Student-self or Admin-read
     """
+    username = principal.username
     logger.debug(
         f"User({username}) trying fetching Student({student_id})'s Applications"
     )
 
-    permission_ok = Access.is_admin(username) or (username == student_id)
+    permission_ok = principal.is_admin or (username == student_id)
     if not permission_ok:
         logger.debug(MSG.permission_denied_msg(username))
         raise HTTPException(status_code=401, detail=MSG.PERMISSION_ERROR)
 
     application_list = []
     try:
-        student_info = students_collection.find_one({"student_id": student_id})
+        student_info = await students_collection.find_one({"student_id": student_id})
         clean_dict(student_info)
     except Exception as e:
         logger.error(MSG.DB_QUERY_ERROR)
@@ -468,7 +485,7 @@ async def get_student_submitted_applications(
     try:
         for uid in AF_uids:
             if isinstance(uid, str):
-                ap_dict: dict = applications_collection.find_one({"uid": uid})
+                ap_dict: dict = await applications_collection.find_one({"uid": uid})
                 clean_dict(ap_dict)
                 if ap_dict:
                     submitted_applications[uid] = ap_dict
@@ -0,0 +1,134 @@
+"""
+Throughput of the API under many concurrent clients.
+
+Runs the ASGI app in-process with N concurrent clients and reports the
+requests per second and latency percentiles per route. Compare the blocking
+data access (before) with the thread-offloaded async data access (after):
+
+    python bench_concurrency.py --mode inline
+    python bench_concurrency.py --mode threaded
+
+`--latency-ms` adds an artificial round trip time to every database call,
+to emulate a remote MongoDB (e.g. Atlas) when benchmarking against localhost.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Dict, List
+
+src_dir = Path(__file__).resolve().parent.parent.parent / "src"
+
+sys.path.insert(0, str(src_dir))
+
+ROUTES = ["/api/events/all", "/api/students/{student_id}", "/api/auth/access"]
+
+
+class SlowCollection:
+    """ Proxy of a pymongo Collection, every call sleeps `latency` first """
+
+    def __init__(self, collection, latency: float):
+        self._collection = collection
+        self._latency = latency
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def slow_call(*args, **kwargs):
+            time.sleep(self._latency)
+            return attr(*args, **kwargs)
+
+        return slow_call
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+async def run_clients(
+    app, url: str, token: str, clients: int, requests_per_client: int
+) -> Dict[str, float]:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_client(http: httpx.AsyncClient):
+        nonlocal errors
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            response = await http.get(url)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    headers = {"Authorization": "Bearer " + token}
+    async with httpx.AsyncClient(
+        app=app, base_url="http://bench", headers=headers
+    ) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*[one_client(http) for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="API concurrency benchmark")
+    parser.add_argument("--mode", choices=["inline", "threaded"], default="threaded")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5, help="per client")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--user", default="admin", help="username for the token")
+    parser.add_argument("--student-id", default="1000000")
+    args = parser.parse_args(argv)
+
+    if args.mode == "inline":
+        os.environ["DB_THREADPOOL_SIZE"] = "0"
+    else:
+        os.environ.setdefault("DB_THREADPOOL_SIZE", str(args.clients))
+
+    from api import async_database
+    from api.access_utils import Access, auth_handler
+    from api.main import app
+
+    if args.latency_ms > 0:
+        for name in async_database.__all__:
+            handle = getattr(async_database, name)
+            if isinstance(handle, async_database.AsyncCollection):
+                handle.delegate = SlowCollection(
+                    handle.delegate, args.latency_ms / 1000
+                )
+
+    token = auth_handler.encode_token(args.user)
+    print(
+        f"mode={args.mode} clients={args.clients} "
+        f"requests/client={args.requests} db_latency={args.latency_ms}ms"
+    )
+    for route in ROUTES:
+        Access.cache.clear()
+        url = route.format(student_id=args.student_id)
+        result = asyncio.run(
+            run_clients(app, url, token, args.clients, args.requests)
+        )
+        print(
+            f"{url:<32} {result['rps']:>8.1f} req/s  "
+            f"p50 {result['p50_ms']:>7.1f} ms  p99 {result['p99_ms']:>7.1f} ms  "
+            f"errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+src_dir = Path(__file__).resolve().parent.parent.parent / "src"
+
+sys.path.insert(0, str(src_dir))
+
+from api.async_database import AsyncCollection, AsyncSession
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        return FakeCursor(
+            sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        )
+
+    def limit(self, n):
+        return FakeCursor(self.docs[:n])
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    name = "fake"
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def find(self, *args, **kwargs):
+        self.calls.append(("find", kwargs))
+        return FakeCursor(list(self.docs))
+
+    def find_one(self, *args, **kwargs):
+        self.calls.append(("find_one", kwargs))
+        return self.docs[0] if self.docs else None
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    def setUp(self):
+        self.docs = [{"n": i} for i in range(250)]
+        self.collection = AsyncCollection(FakeCollection(self.docs))
+
+    def test_find_one(self):
+        doc = asyncio.run(self.collection.find_one({"n": 0}))
+        self.assertEqual(doc, {"n": 0})
+
+    def test_cursor_to_list(self):
+        cursor = self.collection.find().sort("n", -1).limit(3)
+        docs = asyncio.run(cursor.to_list())
+        self.assertEqual(docs, [{"n": 249}, {"n": 248}, {"n": 247}])
+        docs = asyncio.run(self.collection.find().to_list(length=2))
+        self.assertEqual(len(docs), 2)
+
+    def test_cursor_async_iteration(self):
+        async def consume():
+            return [doc async for doc in self.collection.find()]
+
+        self.assertEqual(asyncio.run(consume()), self.docs)
+
+    def test_session_unwrapped(self):
+        session = AsyncSession(client=None)
+        session.delegate = "pymongo-session"
+        asyncio.run(self.collection.find_one({}, session=session))
+        self.assertEqual(
+            self.collection.delegate.calls[-1],
+            ("find_one", {"session": "pymongo-session"}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,6 +80,57 @@ class TestAuthHandler(unittest.TestCase):
             with self.assertRaises(Exception):
                 auth_handler.decode_token(token=i)
 
+    def test_token_without_role_claims(self):
+        token = auth_handler.encode_token(user_id=self.username)
+        payload = auth_handler.decode_payload(token)
+        self.assertIsNone(auth_handler.role_claims(payload))
+
+    def test_token_role_claims(self):
+        roles = {"is_student": True, "is_student_hg": True}
+        token = auth_handler.encode_token(user_id=self.username, roles=roles)
+        payload = auth_handler.decode_payload(token)
+        self.assertEqual(payload["sub"], self.username)
+        self.assertEqual(
+            auth_handler.role_claims(payload),
+            {
+                "is_student": True,
+                "is_student_hg": True,
+                "is_admin": False,
+                "is_admin_write": False,
+            },
+        )
+
+    def test_token_role_claims_outdated(self):
+        username = "test_username_role_change"
+        token = auth_handler.encode_token(user_id=username, roles={"is_student": True})
+        auth_handler.role_versions.bump(username)
+        payload = auth_handler.decode_payload(token)
+        self.assertIsNone(auth_handler.role_claims(payload))
+        # newly issued token is up-to-date again
+        token = auth_handler.encode_token(user_id=username, roles={"is_student": True})
+        payload = auth_handler.decode_payload(token)
+        self.assertTrue(auth_handler.role_claims(payload)["is_student"])
+
+    def test_token_role_claims_tampered(self):
+        token = auth_handler.encode_token(user_id=self.username, roles={})
+        header, payload, signature = token.split(".")
+        with self.assertRaises(Exception):
+            auth_handler.decode_payload(f"{header}.{payload[:-2]}xx.{signature}")
+
+    def test_token_cache(self):
+        token = auth_handler.encode_token(user_id="test_username_token_cache")
+        hits = auth_handler.token_cache.hits
+        self.assertEqual(auth_handler.decode_token(token), "test_username_token_cache")
+        self.assertEqual(auth_handler.decode_token(token), "test_username_token_cache")
+        self.assertEqual(auth_handler.token_cache.hits, hits + 1)
+
+    def test_revoked_token(self):
+        token = auth_handler.encode_token(user_id="test_username_revoked")
+        self.assertEqual(auth_handler.decode_token(token), "test_username_revoked")
+        auth_handler.revoke_token(token)
+        with self.assertRaises(Exception):
+            auth_handler.decode_token(token)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+
+src_dir = Path(__file__).resolve().parent.parent.parent / "src"
+
+sys.path.insert(0, str(src_dir))
+
+from api.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_set_get(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("b", "default"), "default")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # touch "a" so that "b" becomes the least recently used
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_expiry(self):
+        cache = TTLCache(maxsize=4, ttl=0.05)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.pop("a")
+        cache.pop("not_exist")
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+        cache = TTLCache(maxsize=4, ttl=0)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
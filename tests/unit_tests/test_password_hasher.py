@@ -0,0 +1,62 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+from fastapi import HTTPException
+
+src_dir = Path(__file__).resolve().parent.parent.parent / "src"
+
+sys.path.insert(0, str(src_dir))
+
+from api.hashing import PasswordHasher
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(max_workers=2, max_queue=2)
+        self.password = "test_password"
+
+    def tearDown(self):
+        self.hasher.shutdown()
+
+    def test_hash_and_verify(self):
+        async def run():
+            password_hash = await self.hasher.hash(self.password)
+            self.assertTrue(isinstance(password_hash, str))
+            self.assertTrue(password_hash != self.password)
+            self.assertTrue(await self.hasher.verify(self.password, password_hash))
+            self.assertFalse(await self.hasher.verify("wrong", password_hash))
+
+        asyncio.run(run())
+        stats = self.hasher.stats()
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["pending"], 0)
+        self.assertTrue(stats["avg_latency_ms"] > 0)
+
+    def test_hash_many(self):
+        passwords = [f"password_{i}" for i in range(5)]
+
+        async def run():
+            password_hashes = await self.hasher.hash_many(passwords)
+            self.assertEqual(len(password_hashes), len(passwords))
+            for password, password_hash in zip(passwords, password_hashes):
+                self.assertTrue(await self.hasher.verify(password, password_hash))
+            self.assertEqual(await self.hasher.hash_many([]), [])
+
+        asyncio.run(run())
+
+    def test_queue_limit(self):
+        async def run():
+            tasks = [self.hasher.hash(self.password) for _ in range(4)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(run())
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(rejected[0].status_code, 503)
+        self.assertEqual(self.hasher.stats()["rejected"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from fastapi import HTTPException
+
+src_dir = Path(__file__).resolve().parent.parent.parent / "src"
+
+sys.path.insert(0, str(src_dir))
+
+from api import refresh_tokens
+from api.async_database import AsyncCollection
+from api.refresh_tokens import (
+    _digest,
+    issue_refresh_token,
+    revoke_refresh_tokens_of_user,
+    rotate_refresh_token,
+)
+from api.routes.auth import auth_handler
+
+
+class FakeCollection:
+    """ The few refresh_tokens collection operations, on a list """
+
+    name = "refresh_tokens"
+
+    def __init__(self):
+        self.docs = []
+
+    @staticmethod
+    def _match(doc: dict, filter: dict) -> bool:
+        for key, cond in filter.items():
+            if isinstance(cond, dict):
+                if not doc.get(key) > cond["$gt"]:
+                    return False
+            elif doc.get(key) != cond:
+                return False
+        return True
+
+    def insert_one(self, doc: dict):
+        self.docs.append(dict(doc))
+
+    def find_one(self, filter: dict, projection=None):
+        return next((dict(d) for d in self.docs if self._match(d, filter)), None)
+
+    def find_one_and_update(self, filter: dict, update: dict, **kwargs):
+        for doc in self.docs:
+            if self._match(doc, filter):
+                before = dict(doc)
+                doc.update(update["$set"])
+                return before
+        return None
+
+    def delete_many(self, filter: dict):
+        self.docs = [d for d in self.docs if not self._match(d, filter)]
+
+
+class TestRefreshTokens(unittest.TestCase):
+    username = "test_username_refresh"
+
+    def setUp(self):
+        self.collection = FakeCollection()
+        patcher = mock.patch.object(
+            refresh_tokens,
+            "refresh_tokens_collection",
+            AsyncCollection(self.collection),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored(self, refresh_token: str) -> dict:
+        return self.collection.find_one({"token_hash": _digest(refresh_token)})
+
+    def assertRejected(self, refresh_token: str):
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(rotate_refresh_token(refresh_token))
+        self.assertEqual(context.exception.status_code, 401)
+
+    def test_issue(self):
+        refresh_token = asyncio.run(issue_refresh_token(self.username))
+        token_dict = self.stored(refresh_token)
+        self.assertEqual(token_dict["username"], self.username)
+        self.assertFalse(token_dict["used"])
+        self.assertGreater(token_dict["expires_at"], datetime.utcnow())
+        # only the digest is stored
+        self.assertIsNone(self.collection.find_one({"token_hash": refresh_token}))
+
+    def test_rotate(self):
+        refresh_token = asyncio.run(issue_refresh_token(self.username))
+        username, new_token = asyncio.run(rotate_refresh_token(refresh_token))
+        self.assertEqual(username, self.username)
+        self.assertNotEqual(new_token, refresh_token)
+        self.assertTrue(self.stored(refresh_token)["used"])
+        self.assertFalse(self.stored(new_token)["used"])
+        self.assertEqual(
+            self.stored(new_token)["family"], self.stored(refresh_token)["family"]
+        )
+
+    def test_reuse_revokes_family(self):
+        other_login = asyncio.run(issue_refresh_token(self.username))
+        refresh_token = asyncio.run(issue_refresh_token(self.username))
+        _, new_token = asyncio.run(rotate_refresh_token(refresh_token))
+        # the consumed token is presented again: it has leaked
+        self.assertRejected(refresh_token)
+        self.assertIsNone(self.stored(refresh_token))
+        self.assertIsNone(self.stored(new_token))
+        self.assertRejected(new_token)
+        # other logins of the user are not affected
+        username, _ = asyncio.run(rotate_refresh_token(other_login))
+        self.assertEqual(username, self.username)
+
+    def test_expired(self):
+        refresh_token = asyncio.run(issue_refresh_token(self.username))
+        self.collection.docs[-1]["expires_at"] = datetime.utcnow() - timedelta(days=1)
+        self.assertRejected(refresh_token)
+        self.assertFalse(self.stored(refresh_token)["used"])
+
+    def test_unknown(self):
+        self.assertRejected("not-a-refresh-token")
+
+    def test_logout(self):
+        # what POST /api/auth/logout does
+        tokens = [asyncio.run(issue_refresh_token(self.username)) for _ in range(2)]
+        token = auth_handler.encode_token(self.username)
+        auth_handler.revoke_token(token)
+        asyncio.run(revoke_refresh_tokens_of_user(self.username))
+        with self.assertRaises(HTTPException):
+            auth_handler.decode_token(token)
+        for refresh_token in tokens:
+            self.assertIsNone(self.stored(refresh_token))
+            self.assertRejected(refresh_token)
+
+
+if __name__ == "__main__":
+    unittest.main()